@@ -0,0 +1,106 @@
+"""Shared FastHttpUser base for the Locust load tests.
+
+Both locustfile.py and locustfile-scenarios.py subclass BaseOrderUser, so the
+hot task helpers are parsed and compiled once per process and the payload
+tables keep a single identity across all user classes.
+"""
+
+import logging
+from collections import deque
+from random import randrange
+
+import orjson
+from locust import FastHttpUser
+
+from order_payloads import ITEMS, ITEMS_ENCODED, POOL_MASK, POOL_PICKS, POOL_SIZE, POOL_SIZES, random_items_body
+
+logger = logging.getLogger(__name__)
+
+# One frozen headers dict reused by every POST of every user, instead of a
+# small-dict allocation per call
+JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+
+class BaseOrderUser(FastHttpUser):
+    """Common order-service traffic helpers shared by all user classes"""
+
+    abstract = True
+
+    # Connection tuning: 10 connections per user matches the service-side
+    # bulkhead limit so the load generator never becomes the bottleneck,
+    # even for BulkheadUser with wait_time = constant(0)
+    concurrency = 10
+    network_timeout = 10.0
+    connection_timeout = 2.0
+    insecure = True
+
+    # 5xx responses are expected while chaos scenarios are active; plain load
+    # tests flip this off so server errors count as failures
+    tolerate_server_errors = True
+
+    # Sample items and the pre-sampled order pool are shared via order_payloads
+    items = ITEMS
+    items_encoded = ITEMS_ENCODED
+    _pool_sizes, _pool_picks = POOL_SIZES, POOL_PICKS
+    _pool_cursor = None
+
+    def on_start(self):
+        # Ready-made /order/{id} URLs for retrieval; per-user (a single
+        # writer, like a real user's own order history) so concurrent users
+        # never share mutable state, with O(1) eviction at the cap
+        self.order_id_urls = deque(maxlen=100)
+
+    def create_valid_order(self, num_items=None):
+        """Create a valid order with random items"""
+        if num_items is None:
+            cursor = self._pool_cursor
+            if cursor is None:
+                # Start each user at a random offset so users don't march in lockstep
+                cursor = randrange(POOL_SIZE)
+            selected_items = self._pool_picks[cursor][:self._pool_sizes[cursor]]
+            self._pool_cursor = (cursor + 1) & POOL_MASK
+            payload = b'{"items":[' + b",".join(selected_items) + b"]}"
+        else:
+            payload = random_items_body(num_items)
+
+        with self.client.post("/order/create", data=payload, headers=JSON_HEADERS, catch_response=True, name="/order/create") as response:
+            if response.status_code == 200:
+                try:
+                    order_id = orjson.loads(response.content)["order_id"]
+                    self.order_id_urls.append(f"/order/{order_id}")
+                    response.success()
+                except (KeyError, orjson.JSONDecodeError) as e:
+                    response.failure(f"Failed to parse response: {e}")
+            elif response.status_code >= 500 and self.tolerate_server_errors:
+                # Expected during chaos scenarios
+                response.success()
+            else:
+                response.failure(f"Got status {response.status_code}")
+
+    def get_order_details(self, _randrange=randrange):
+        """Retrieve order details"""
+        if self.order_id_urls:
+            # Indexed access; random.choice on a deque walks it from one end
+            url = self.order_id_urls[_randrange(len(self.order_id_urls))]
+            self.client.get(url, name="/order/:orderId")
+        else:
+            # Try a dummy ID to test 404 handling
+            self.client.get("/order/dummy-order-id", name="/order/:orderId")
+
+    def check_circuit_status(self):
+        """Check circuit breaker status"""
+        with self.client.get("/order/circuit-status", catch_response=True, name="/order/circuit-status") as response:
+            if response.status_code != 200:
+                return
+            # Only pay for the decode when someone is listening (headless runs
+            # often log at WARNING or above)
+            if logger.isEnabledFor(logging.INFO):
+                try:
+                    status = orjson.loads(response.content)
+                    logger.info("Circuit Status - Inventory: %s, Payment: %s",
+                                status['inventory_circuit']['state'],
+                                status['payment_circuit']['state'])
+                except Exception as e:
+                    response.failure(f"Failed to parse circuit status: {e}")
+                    return
+            response.success()
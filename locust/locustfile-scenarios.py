@@ -16,80 +16,38 @@ Run with different user classes to test different scenarios:
     locust -f locustfile.py --host http://localhost:8080 --headless --users 10 --spawn-rate 2 -t 60s
 """
 
-from locust import FastHttpUser, task, between, events, constant, LoadTestShape
-import random
-import time
+from locust import task, between, events, constant, constant_pacing, LoadTestShape
 import logging
+from bisect import bisect_right
+from random import choices
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+from _locust_base import JSON_HEADERS, BaseOrderUser
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Constant invalid payloads, encoded once at import for the mixed workload
+_INVALID_BODIES = (
+    orjson.dumps({"items": []}),
+    orjson.dumps({"items": [{"item_id": "item-1", "quantity": 0, "price": 999.99}]}),
+    orjson.dumps({"items": [{"item_id": "item-1", "quantity": 1, "price": -10}]}),
+)
+
 
-class ResilienceTestUser(FastHttpUser):
+class ResilienceTestUser(BaseOrderUser):
     """Base user class with common functionality"""
-    
+
+    abstract = True
+
     # Service endpoints
     ORDER_SERVICE = ""  # Will be set from host
     INVENTORY_SERVICE = "http://localhost:8081"
     PAYMENT_SERVICE = "http://localhost:8082"
-    
-    # Store created order IDs for retrieval
-    order_ids = []
-    
-    # Sample items for orders
-    items = [
-        {"item_id": "item-1", "quantity": 1, "price": 999.99},
-        {"item_id": "item-2", "quantity": 2, "price": 29.99},
-        {"item_id": "item-3", "quantity": 1, "price": 79.99},
-        {"item_id": "item-4", "quantity": 1, "price": 299.99},
-        {"item_id": "item-5", "quantity": 3, "price": 149.99}
-    ]
-    
-    def create_valid_order(self, num_items=None):
-        """Create a valid order with random items"""
-        if num_items is None:
-            num_items = random.randint(1, 3)
-        
-        selected_items = random.sample(self.items, min(num_items, len(self.items)))
-        payload = {"items": selected_items}
-        
-        with self.client.post("/order/create", json=payload, catch_response=True, name="/order/create") as response:
-            if response.status_code == 200:
-                try:
-                    order_data = response.json()
-                    order_id = order_data.get("order_id")
-                    if order_id and len(self.order_ids) < 100:
-                        self.order_ids.append(order_id)
-                    response.success()
-                except Exception as e:
-                    response.failure(f"Failed to parse response: {e}")
-            elif response.status_code >= 500:
-                # Expected during chaos scenarios
-                response.success()
-            else:
-                response.failure(f"Got status {response.status_code}")
-    
-    def get_order_details(self):
-        """Retrieve order details"""
-        if self.order_ids:
-            order_id = random.choice(self.order_ids)
-            self.client.get(f"/order/{order_id}", name="/order/:orderId")
-        else:
-            # Try a dummy ID to test 404 handling
-            self.client.get("/order/dummy-order-id", name="/order/:orderId")
-    
-    def check_circuit_status(self):
-        """Check circuit breaker status"""
-        with self.client.get("/order/circuit-status", catch_response=True, name="/order/circuit-status") as response:
-            if response.status_code == 200:
-                try:
-                    status = response.json()
-                    logger.info(f"Circuit Status - Inventory: {status['inventory_circuit']['state']}, "
-                              f"Payment: {status['payment_circuit']['state']}")
-                    response.success()
-                except Exception as e:
-                    response.failure(f"Failed to parse circuit status: {e}")
 
 
 class NormalOperationUser(ResilienceTestUser):
@@ -97,7 +55,9 @@ class NormalOperationUser(ResilienceTestUser):
     Scenario 1: Normal Operation
     Tests the system under normal conditions without any chaos
     """
-    wait_time = between(0.5, 2)
+    # Pacing at the mean of the old between(0.5, 2): no RNG per wait, and the
+    # offered rate stays steady when service latency varies
+    wait_time = constant_pacing(1.25)
     
     @task(10)
     def create_order(self):
@@ -121,62 +81,44 @@ class FailFastUser(ResilienceTestUser):
     Tests input validation (should fail fast without calling downstream services)
     """
     wait_time = between(0.5, 1.5)
-    
-    @task(3)
-    def empty_order(self):
-        """Test empty order - should fail fast"""
-        payload = {"items": []}
-        with self.client.post("/order/create", json=payload, catch_response=True, 
-                            name="/order/create [empty]") as response:
+
+    # Invalid payloads are constant, so encode them once at class load
+    EMPTY_BODY = orjson.dumps({"items": []})
+    INVALID_QUANTITY_BODY = orjson.dumps(
+        {"items": [{"item_id": "item-1", "quantity": 0, "price": 999.99}]})
+    INVALID_PRICE_BODY = orjson.dumps(
+        {"items": [{"item_id": "item-1", "quantity": 1, "price": -10}]})
+    MISSING_ITEM_ID_BODY = orjson.dumps(
+        {"items": [{"item_id": "", "quantity": 1, "price": 99.99}]})
+
+    def _expect_fail_fast(self, body, name):
+        """POST an invalid payload; the 400 fail-fast reply counts as success"""
+        with self.client.post("/order/create", data=body, headers=JSON_HEADERS,
+                            catch_response=True, name=name) as response:
             if response.status_code == 400:
                 response.success()
             else:
                 response.failure(f"Expected 400, got {response.status_code}")
-    
+
+    @task(3)
+    def empty_order(self):
+        """Test empty order - should fail fast"""
+        self._expect_fail_fast(self.EMPTY_BODY, "/order/create [empty]")
+
     @task(3)
     def invalid_quantity(self):
         """Test invalid quantity - should fail fast"""
-        payload = {
-            "items": [
-                {"item_id": "item-1", "quantity": 0, "price": 999.99}
-            ]
-        }
-        with self.client.post("/order/create", json=payload, catch_response=True,
-                            name="/order/create [invalid quantity]") as response:
-            if response.status_code == 400:
-                response.success()
-            else:
-                response.failure(f"Expected 400, got {response.status_code}")
-    
+        self._expect_fail_fast(self.INVALID_QUANTITY_BODY, "/order/create [invalid quantity]")
+
     @task(3)
     def invalid_price(self):
         """Test invalid price - should fail fast"""
-        payload = {
-            "items": [
-                {"item_id": "item-1", "quantity": 1, "price": -10}
-            ]
-        }
-        with self.client.post("/order/create", json=payload, catch_response=True,
-                            name="/order/create [invalid price]") as response:
-            if response.status_code == 400:
-                response.success()
-            else:
-                response.failure(f"Expected 400, got {response.status_code}")
-    
+        self._expect_fail_fast(self.INVALID_PRICE_BODY, "/order/create [invalid price]")
+
     @task(1)
     def missing_item_id(self):
         """Test missing item_id - should fail fast"""
-        payload = {
-            "items": [
-                {"item_id": "", "quantity": 1, "price": 99.99}
-            ]
-        }
-        with self.client.post("/order/create", json=payload, catch_response=True,
-                            name="/order/create [missing item_id]") as response:
-            if response.status_code == 400:
-                response.success()
-            else:
-                response.failure(f"Expected 400, got {response.status_code}")
+        self._expect_fail_fast(self.MISSING_ITEM_ID_BODY, "/order/create [missing item_id]")
 
 
 class CircuitBreakerInventoryUser(ResilienceTestUser):
@@ -184,7 +126,8 @@ class CircuitBreakerInventoryUser(ResilienceTestUser):
     Scenario 3: Circuit Breaker Demo (Inventory Failures)
     Tests circuit breaker with inventory service failures
     """
-    wait_time = between(1, 3)
+    # Pacing keeps the offered rate steady while chaos stretches latency
+    wait_time = constant_pacing(2)
     
     @task(8)
     def create_order_with_failures(self):
@@ -202,7 +145,8 @@ class CircuitBreakerPaymentUser(ResilienceTestUser):
     Scenario 4: Circuit Breaker Demo (Payment Failures)
     Tests circuit breaker with payment service failures and slow responses
     """
-    wait_time = between(1, 3)
+    # Pacing keeps the offered rate steady while chaos stretches latency
+    wait_time = constant_pacing(2)
     
     @task(8)
     def create_order_with_failures(self):
@@ -233,7 +177,8 @@ class CombinedChaosUser(ResilienceTestUser):
     Scenario 6: Combined Chaos
     Tests all resilience patterns with multiple failure modes enabled
     """
-    wait_time = between(0.5, 2)
+    # Pacing keeps the offered rate steady while chaos stretches latency
+    wait_time = constant_pacing(1.25)
     
     @task(10)
     def create_order_with_all_chaos(self):
@@ -259,20 +204,16 @@ class MixedWorkloadUser(ResilienceTestUser):
     wait_time = between(0.5, 2)
     
     @task(10)
-    def create_valid_order(self):
+    def create_order(self):
         """Create valid orders"""
         self.create_valid_order()
     
     @task(2)
-    def create_invalid_order(self):
-        """Create invalid orders (fail fast)"""
-        invalid_payloads = [
-            {"items": []},
-            {"items": [{"item_id": "item-1", "quantity": 0, "price": 999.99}]},
-            {"items": [{"item_id": "item-1", "quantity": 1, "price": -10}]},
-        ]
-        payload = random.choice(invalid_payloads)
-        self.client.post("/order/create", json=payload, name="/order/create [invalid]")
+    def create_invalid_order(self, _choices=choices):
+        """Create invalid orders (fail fast) as a burst of four back-to-back
+        requests on the keep-alive connection"""
+        for payload in _choices(_INVALID_BODIES, k=4):
+            self.client.post("/order/create", data=payload, headers=JSON_HEADERS, name="/order/create [invalid]")
     
     @task(3)
     def get_order(self):
@@ -305,14 +246,17 @@ class StepLoadShape(LoadTestShape):
         {"duration": 240, "users": 75, "spawn_rate": 5},
         {"duration": 300, "users": 100, "spawn_rate": 5},
     ]
-    
+
+    # Precomputed from stages so tick() is a single bisect instead of a
+    # per-second scan over the stage dicts
+    _stage_ends = [s["duration"] for s in stages]
+    _stage_out = [(s["users"], s["spawn_rate"]) for s in stages]
+
     def tick(self):
-        run_time = self.get_run_time()
-        
-        for stage in self.stages:
-            if run_time < stage["duration"]:
-                return (stage["users"], stage["spawn_rate"])
-        
+        i = bisect_right(self._stage_ends, self.get_run_time())
+        if i < len(self._stage_out):
+            return self._stage_out[i]
+
         return None  # Stop test after all stages
 
 
@@ -334,14 +278,17 @@ class SpikeLoadShape(LoadTestShape):
         {"duration": 120, "users": 100, "spawn_rate": 20},
         {"duration": 150, "users": 10, "spawn_rate": 10},
     ]
-    
+
+    # Precomputed from stages so tick() is a single bisect instead of a
+    # per-second scan over the stage dicts
+    _stage_ends = [s["duration"] for s in stages]
+    _stage_out = [(s["users"], s["spawn_rate"]) for s in stages]
+
     def tick(self):
-        run_time = self.get_run_time()
-        
-        for stage in self.stages:
-            if run_time < stage["duration"]:
-                return (stage["users"], stage["spawn_rate"])
-        
+        i = bisect_right(self._stage_ends, self.get_run_time())
+        if i < len(self._stage_out):
+            return self._stage_out[i]
+
         return None
 
 
@@ -388,71 +335,77 @@ def on_test_stop(environment, **kwargs):
 
 # Helper class for direct chaos control from Locust
 
+# Shared keep-alive session for chaos-control calls; avoids a fresh TCP
+# handshake (and Session teardown) per call
+_chaos_session = requests.Session()
+_chaos_session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+
 class ChaosController:
     """Helper class to control chaos engineering endpoints"""
-    
+
     INVENTORY_SERVICE = "http://localhost:8081"
     PAYMENT_SERVICE = "http://localhost:8082"
-    
+
     @staticmethod
     def enable_inventory_chaos():
         """Enable inventory service chaos (30% failure rate)"""
-        import requests
         try:
-            resp = requests.post(f"{ChaosController.INVENTORY_SERVICE}/chaos/inventory/enable", timeout=5)
-            logger.info(f"✅ Inventory chaos enabled: {resp.json()}")
+            resp = _chaos_session.post(f"{ChaosController.INVENTORY_SERVICE}/chaos/inventory/enable", timeout=5)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Inventory chaos enabled: %s", orjson.loads(resp.content))
         except Exception as e:
-            logger.error(f"❌ Failed to enable inventory chaos: {e}")
-    
+            logger.error("❌ Failed to enable inventory chaos: %s", e)
+
     @staticmethod
     def disable_inventory_chaos():
         """Disable inventory service chaos"""
-        import requests
         try:
-            resp = requests.post(f"{ChaosController.INVENTORY_SERVICE}/chaos/inventory/disable", timeout=5)
-            logger.info(f"✅ Inventory chaos disabled: {resp.json()}")
+            resp = _chaos_session.post(f"{ChaosController.INVENTORY_SERVICE}/chaos/inventory/disable", timeout=5)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Inventory chaos disabled: %s", orjson.loads(resp.content))
         except Exception as e:
-            logger.error(f"❌ Failed to disable inventory chaos: {e}")
-    
+            logger.error("❌ Failed to disable inventory chaos: %s", e)
+
     @staticmethod
     def enable_inventory_slow():
         """Enable inventory slow mode (2-5 second delays)"""
-        import requests
         try:
-            resp = requests.post(f"{ChaosController.INVENTORY_SERVICE}/chaos/inventory/slow", timeout=5)
-            logger.info(f"✅ Inventory slow mode enabled: {resp.json()}")
+            resp = _chaos_session.post(f"{ChaosController.INVENTORY_SERVICE}/chaos/inventory/slow", timeout=5)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Inventory slow mode enabled: %s", orjson.loads(resp.content))
         except Exception as e:
-            logger.error(f"❌ Failed to enable inventory slow mode: {e}")
-    
+            logger.error("❌ Failed to enable inventory slow mode: %s", e)
+
     @staticmethod
     def enable_payment_chaos():
         """Enable payment service chaos (40% failure rate)"""
-        import requests
         try:
-            resp = requests.post(f"{ChaosController.PAYMENT_SERVICE}/chaos/payment/enable", timeout=5)
-            logger.info(f"✅ Payment chaos enabled: {resp.json()}")
+            resp = _chaos_session.post(f"{ChaosController.PAYMENT_SERVICE}/chaos/payment/enable", timeout=5)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Payment chaos enabled: %s", orjson.loads(resp.content))
         except Exception as e:
-            logger.error(f"❌ Failed to enable payment chaos: {e}")
-    
+            logger.error("❌ Failed to enable payment chaos: %s", e)
+
     @staticmethod
     def disable_payment_chaos():
         """Disable payment service chaos"""
-        import requests
         try:
-            resp = requests.post(f"{ChaosController.PAYMENT_SERVICE}/chaos/payment/disable", timeout=5)
-            logger.info(f"✅ Payment chaos disabled: {resp.json()}")
+            resp = _chaos_session.post(f"{ChaosController.PAYMENT_SERVICE}/chaos/payment/disable", timeout=5)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Payment chaos disabled: %s", orjson.loads(resp.content))
         except Exception as e:
-            logger.error(f"❌ Failed to disable payment chaos: {e}")
-    
+            logger.error("❌ Failed to disable payment chaos: %s", e)
+
     @staticmethod
     def enable_payment_slow():
         """Enable payment slow mode (5-10 second delays)"""
-        import requests
         try:
-            resp = requests.post(f"{ChaosController.PAYMENT_SERVICE}/chaos/payment/slow", timeout=5)
-            logger.info(f"✅ Payment slow mode enabled: {resp.json()}")
+            resp = _chaos_session.post(f"{ChaosController.PAYMENT_SERVICE}/chaos/payment/slow", timeout=5)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Payment slow mode enabled: %s", orjson.loads(resp.content))
         except Exception as e:
-            logger.error(f"❌ Failed to enable payment slow mode: {e}")
+            logger.error("❌ Failed to enable payment slow mode: %s", e)
     
     @staticmethod
     def disable_all_chaos():
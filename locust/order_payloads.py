@@ -0,0 +1,42 @@
+"""Shared order payload data for the Locust load tests.
+
+The sample items are encoded to JSON bytes once at import, so the hot
+create-order paths only join ready-made fragments instead of re-serializing
+the same dicts on every request. Adding more items here amortizes the
+encoding once per process, not once per task.
+"""
+
+from random import randint, sample
+
+import orjson
+
+ITEMS = [
+    {"item_id": "item-1", "quantity": 1, "price": 999.99},
+    {"item_id": "item-2", "quantity": 2, "price": 29.99},
+    {"item_id": "item-3", "quantity": 1, "price": 79.99},
+    {"item_id": "item-4", "quantity": 1, "price": 299.99},
+    {"item_id": "item-5", "quantity": 3, "price": 149.99}
+]
+
+ITEMS_ENCODED = tuple(orjson.dumps(i) for i in ITEMS)
+
+# Ring buffer of pre-sampled order contents; hot tasks walk it with a
+# per-user cursor instead of calling randint + sample on every request.
+POOL_SIZE = 4096
+POOL_MASK = POOL_SIZE - 1
+
+
+def _build_order_pool(population=ITEMS_ENCODED, pool_size=POOL_SIZE):
+    """Pre-sample order sizes and item picks for the ring buffer."""
+    sizes = tuple(randint(1, 3) for _ in range(pool_size))
+    picks = tuple(tuple(sample(population, 3)) for _ in range(pool_size))
+    return sizes, picks
+
+
+POOL_SIZES, POOL_PICKS = _build_order_pool()
+
+
+def random_items_body(num_items, _sample=sample):
+    """Return a ready-to-send order body with num_items random items."""
+    selected = _sample(ITEMS_ENCODED, min(num_items, len(ITEMS_ENCODED)))
+    return b'{"items":[' + b",".join(selected) + b"]}"